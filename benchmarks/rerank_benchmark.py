@@ -0,0 +1,138 @@
+"""
+Reranking benchmark.
+Measures retrieval and end-to-end latency and hit rate as the number of
+over-fetched candidates (N) varies, against a baseline without reranking
+(N = off).
+
+Usage:
+    python benchmarks/rerank_benchmark.py queries.json [--skip-llm]
+
+queries.json is a list of {"query": ..., "expected": <product name>} objects.
+A query is a hit if the expected product is among the results forwarded to
+the LLM. Each query is retrieved once; the same results are scored and sent
+to the LLM.
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import Settings
+from models.product import ProductDocument
+from services.data_loader import DataLoader
+from services.vector_store import VectorStoreManager
+from services.recommendation import RecommendationService
+from services.reranker import Reranker
+from utils.formatters import ResultFormatter
+
+
+CANDIDATE_COUNTS = [2, 4, 8, 16, 32]
+
+
+def percentile(latencies: list, fraction: float) -> float:
+    """Latency percentile of a sorted list."""
+    return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))]
+
+
+def run_case(service: RecommendationService, query: str, k: int, skip_llm: bool):
+    """
+    Retrieve once and, unless skipped, send the same results to the LLM.
+    
+    Args:
+        service: Initialized RecommendationService
+        query: Benchmark query
+        k: Number of results forwarded to the LLM
+        skip_llm: If True, only time retrieval and reranking
+    
+    Returns:
+        Tuple of (retrieved results, retrieval ms, total ms)
+    """
+    start = time.perf_counter()
+    results = service._retrieve(query, k)
+    retrieval_ms = (time.perf_counter() - start) * 1000
+    
+    if not skip_llm and results:
+        prompt = service.prompt_template.format(
+            context=ResultFormatter.format_search_results(results),
+            input=query
+        )
+        service.llm.invoke(prompt)
+    
+    return results, retrieval_ms, (time.perf_counter() - start) * 1000
+
+
+def run_benchmark(service: RecommendationService, cases: list, skip_llm: bool) -> None:
+    """
+    Run every case without reranking and for each candidate count, and
+    print a summary table.
+    
+    Args:
+        service: Initialized RecommendationService
+        cases: List of {"query", "expected"} dictionaries
+        skip_llm: If True, only time retrieval and reranking
+    """
+    k = Settings.DEFAULT_TOP_K
+    reranker = service.reranker
+    candidate_count = Settings.RERANK_CANDIDATES
+    print(
+        f"{'N':>4} {'hit rate':>9} {'retr p50':>9} {'retr p95':>9} "
+        f"{'p50 ms':>9} {'p95 ms':>9}"
+    )
+    
+    # The first row is the baseline without reranking
+    for n in ["off"] + CANDIDATE_COUNTS:
+        if n == "off":
+            service.reranker = None
+        else:
+            service.reranker = reranker or Reranker()
+            Settings.RERANK_CANDIDATES = n
+        retrieval_latencies = []
+        latencies = []
+        hits = 0
+        
+        for case in cases:
+            results, retrieval_ms, total_ms = run_case(
+                service, case["query"], k, skip_llm
+            )
+            retrieval_latencies.append(retrieval_ms)
+            latencies.append(total_ms)
+            
+            names = [doc.metadata["name"] for doc, _ in results]
+            hits += case["expected"] in names
+        
+        retrieval_latencies.sort()
+        latencies.sort()
+        print(
+            f"{n:>4} {hits / len(cases):>9.2%} "
+            f"{statistics.median(retrieval_latencies):>9.1f} "
+            f"{percentile(retrieval_latencies, 0.95):>9.1f} "
+            f"{statistics.median(latencies):>9.1f} {percentile(latencies, 0.95):>9.1f}"
+        )
+    
+    service.reranker = reranker
+    Settings.RERANK_CANDIDATES = candidate_count
+
+
+def main():
+    """Benchmark entry point."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("queries", type=Path)
+    parser.add_argument("--skip-llm", action="store_true")
+    args = parser.parse_args()
+    
+    Settings.validate()
+    products = DataLoader.load_products_from_json(Settings.PRODUCTS_JSON_PATH)
+    vector_store = VectorStoreManager()
+    vector_store.initialize(ProductDocument.from_products(products))
+    
+    cases = json.loads(args.queries.read_text(encoding="utf-8"))
+    run_benchmark(RecommendationService(vector_store), cases, args.skip_llm)
+
+
+if __name__ == "__main__":
+    main()
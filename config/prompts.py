@@ -7,6 +7,9 @@ All LLM prompt templates are centralized here for easy management and version co
 class Prompts:
     """Centralized prompt templates for the application."""
     
+    # Bump whenever RECOMMENDATION_PROMPT changes
+    RECOMMENDATION_PROMPT_VERSION = "1"
+    
     RECOMMENDATION_PROMPT = """
 You are a helpful medical advisor assistant.
 A customer has described their condition or symptoms.
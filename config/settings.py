@@ -28,17 +28,74 @@ class Settings:
     LLM_MODEL = "gpt-4o-mini"
     LLM_TEMPERATURE = 0
     
+    LLM_MAX_RETRIES = 0              # Retries are handled by hedging instead
+    EMBEDDING_MAX_RETRIES = 0        # A retry would outlive the retrieval budget
+    
+    # Deadline and hedging configuration
+    REQUEST_DEADLINE_S = 15.0        # Total time for one recommendation
+    RETRIEVAL_DEADLINE_SHARE = 0.3   # Share of the deadline for embedding + search
+    RETRIEVAL_WORKERS = 8            # Threads running embedding + vector search
+    LLM_WORKERS = 16                 # Threads running LLM calls, backups included
+    HEDGE_ENABLED = True
+    HEDGE_PERCENTILE = 0.95          # Backup LLM call sent after this latency
+    HEDGE_MIN_SAMPLES = 20           # Samples needed before using the percentile
+    HEDGE_DEFAULT_DELAY_S = 5.0      # Hedge delay until enough samples exist
+    HEDGE_MIN_DELAY_S = 1.0
+    HEDGE_LATENCY_WINDOW = 200       # Recent LLM latencies kept
+    
+    # HTTP connection pool configuration (per OpenAI client)
+    HTTP_MAX_CONNECTIONS = 20
+    HTTP_MAX_KEEPALIVE_CONNECTIONS = 10
+    HTTP_KEEPALIVE_EXPIRY = 30.0     # seconds an idle connection is kept open
+    HTTP_TIMEOUT = REQUEST_DEADLINE_S  # Calls never outlive a request deadline
+    HTTP_CONNECT_TIMEOUT = 5.0       # seconds
+    # Query embeddings never outlive the retrieval budget
+    EMBEDDING_TIMEOUT = REQUEST_DEADLINE_S * RETRIEVAL_DEADLINE_SHARE
+    
     # Vector database configuration
     PERSIST_DIRECTORY = str(CHROMA_DB_DIR)
+    VECTOR_DISTANCE_SPACE = "cosine"  # Relevance scores are cosine similarities
+    INDEX_KEEP_GENERATIONS = 2       # Serving generation plus one for rollback
+    INDEX_VALIDATION_SAMPLES = 10    # Products re-queried before a swap
+    INDEX_VALIDATION_K = 3           # Sample must appear in the top k results
+    INDEX_MIN_RECALL = 0.8           # Minimum sample recall to accept a rebuild
+    INDEX_EMBEDDING_TIMEOUT = 60.0   # Bulk embedding calls during a rebuild
+    INDEX_EMBEDDING_MAX_RETRIES = 2
     
     # Search configuration
     DEFAULT_TOP_K = 2
-    SIMILARITY_THRESHOLD = 0.6
+    SIMILARITY_THRESHOLD = 0.3       # Min cosine relevance (0-1, higher is better)
     DESCRIPTION_PREVIEW_LENGTH = 300
     
+    # Reranking configuration
+    RERANK_ENABLED = True
+    RERANK_CANDIDATES = 8            # Candidates over-fetched from the vector store
+    RERANK_BUDGET_MS = 20            # Max time spent rescoring per query
+    RERANK_CROSS_ENCODER_MODEL = None  # e.g. "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    RERANK_BATCH_SIZE = 2            # Cross-encoder pairs scored between budget checks
+    RERANK_VECTOR_WEIGHT = 1.0
+    RERANK_NAME_WEIGHT = 0.6
+    RERANK_FIELD_WEIGHT = 0.4
+    RERANK_LEXICAL_WEIGHT = 0.2
+    
+    # Fast path (LLM-free) routing policy
+    FAST_PATH_ENABLED = True
+    FAST_PATH_NAME_MATCH_RATIO = 1.0  # Share of query words found in a product name
+    FAST_PATH_NAME_COVERAGE = 0.6     # Share of the primary product name in the query
+    FAST_PATH_MIN_SCORE = 0.7         # Top relevance needed to answer without the LLM
+    FAST_PATH_SCORE_MARGIN = 0.15     # Required relevance lead over the runner-up
+    
+    # Autocomplete configuration
+    AUTOCOMPLETE_MAX_SUGGESTIONS = 8
+    AUTOCOMPLETE_MAX_INGREDIENTS = 5     # Leading composition entries indexed
+    AUTOCOMPLETE_MIN_TRIGRAM_RATIO = 0.5  # Fuzzy fallback match threshold
+    
     # UI configuration
     APP_TITLE = "Pharmakon Product Recommender"
     LOGO_WIDTH = 100
+    SERVICE_UNAVAILABLE_MESSAGE = (
+        "Product search is temporarily unavailable. Please try again shortly."
+    )
     
     # Company information
     COMPANY_INFO = {
@@ -5,6 +5,8 @@ A clean architecture application for pharmaceutical product recommendations.
 import sys
 from pathlib import Path
 
+import streamlit as st
+
 # Add project root to Python path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
@@ -13,13 +15,18 @@ from models.product import ProductDocument
 from services.data_loader import DataLoader
 from services.vector_store import VectorStoreManager
 from services.recommendation import RecommendationService
+from services.autocomplete import ProductAutocomplete
 from ui.streamlit_app import run_app
 
 
+@st.cache_resource
 def initialize_application():
     """
     Initialize the application by setting up all required services.
     
+    Cached as a shared resource so every Streamlit session uses the same
+    service, HTTP connection pools and in-flight request coalescing.
+    
     Returns:
         RecommendationService: Fully initialized recommendation service
     """
@@ -41,8 +48,14 @@ def initialize_application():
     vector_store.initialize(documents)
     print(f"Vector store initialized with {vector_store.get_collection_count()} documents.")
     
+    # Build the in-memory autocomplete index
+    autocomplete = ProductAutocomplete(products)
+    
     # Initialize recommendation service
-    recommendation_service = RecommendationService(vector_store)
+    recommendation_service = RecommendationService(
+        vector_store,
+        autocomplete=autocomplete
+    )
     
     return recommendation_service
 
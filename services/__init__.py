@@ -1,6 +1,10 @@
 """Services package for business logic."""
 from .data_loader import DataLoader
 from .vector_store import VectorStoreManager
+from .reranker import Reranker
+from .query_router import QueryRouter
+from .autocomplete import ProductAutocomplete
 from .recommendation import RecommendationService
 
-__all__ = ["DataLoader", "VectorStoreManager", "RecommendationService"]
+__all__ = ["DataLoader", "VectorStoreManager", "Reranker", "QueryRouter",
+           "ProductAutocomplete", "RecommendationService"]
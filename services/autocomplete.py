@@ -0,0 +1,206 @@
+"""
+Autocomplete service.
+In-memory prefix and trigram index over product names and key ingredients
+for instant typeahead suggestions.
+"""
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+
+from config.settings import Settings
+from models.product import Product
+from utils.text import extract_sections, split_words
+
+
+@dataclass
+class _IndexState:
+    """Immutable snapshot of the index, swapped as a whole on refresh."""
+    
+    products: List[Product] = field(default_factory=list)
+    names: List[str] = field(default_factory=list)
+    by_name: Dict[str, int] = field(default_factory=dict)
+    name_prefixes: Dict[str, Set[int]] = field(default_factory=dict)
+    ingredient_prefixes: Dict[str, Set[int]] = field(default_factory=dict)
+    trigrams: Dict[str, Set[int]] = field(default_factory=dict)
+
+
+class ProductAutocomplete:
+    """
+    Typeahead suggestions for product names and key ingredients.
+    
+    Every word of every product name and key ingredient is indexed by all of
+    its prefixes, so a keystroke costs one dictionary lookup per typed word.
+    A trigram index provides a fuzzy fallback for misspelled names.
+    """
+    
+    _INGREDIENT_SPLIT = re.compile(r"[,;\n]")
+    INGREDIENT_HEADINGS = ("composition", "ingredients?")
+    
+    def __init__(self, products: Optional[List[Product]] = None):
+        """
+        Initialize the autocomplete index.
+        
+        Args:
+            products: Optional catalog to index immediately
+        """
+        self._state = _IndexState()
+        
+        if products:
+            self.refresh(products)
+    
+    @staticmethod
+    def _trigrams(text: str) -> Set[str]:
+        """Character trigrams of text, padded to match word boundaries."""
+        padded = f"  {text.lower()} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+    
+    @classmethod
+    def key_ingredients(cls, product: Product) -> List[str]:
+        """
+        Extract the leading ingredients from a product's composition section.
+        
+        Args:
+            product: Product to inspect
+        
+        Returns:
+            Up to Settings.AUTOCOMPLETE_MAX_INGREDIENTS ingredient names
+        """
+        composition = extract_sections(
+            product.product_description, cls.INGREDIENT_HEADINGS
+        )
+        ingredients = [
+            part.strip()
+            for part in cls._INGREDIENT_SPLIT.split(composition)
+            if part.strip()
+        ]
+        
+        return ingredients[:Settings.AUTOCOMPLETE_MAX_INGREDIENTS]
+    
+    def refresh(self, products: List[Product]) -> None:
+        """
+        Rebuild the index from the catalog.
+        
+        The new index is built off to the side and swapped in with a single
+        assignment, so lookups during a refresh see the old or new catalog,
+        never a partial one.
+        
+        Args:
+            products: Full product catalog
+        """
+        state = _IndexState()
+        name_prefixes = defaultdict(set)
+        ingredient_prefixes = defaultdict(set)
+        trigrams = defaultdict(set)
+        
+        for product in products:
+            if not product.product_name or product.product_name.lower() in state.by_name:
+                continue
+            
+            idx = len(state.products)
+            state.products.append(product)
+            state.names.append(product.product_name)
+            state.by_name[product.product_name.lower()] = idx
+            
+            for word in split_words(product.product_name):
+                for end in range(1, len(word) + 1):
+                    name_prefixes[word[:end]].add(idx)
+            for gram in self._trigrams(product.product_name):
+                trigrams[gram].add(idx)
+            
+            for ingredient in self.key_ingredients(product):
+                for word in split_words(ingredient):
+                    for end in range(1, len(word) + 1):
+                        ingredient_prefixes[word[:end]].add(idx)
+        
+        state.name_prefixes = dict(name_prefixes)
+        state.ingredient_prefixes = dict(ingredient_prefixes)
+        state.trigrams = dict(trigrams)
+        
+        self._state = state
+    
+    def suggest(
+        self,
+        text: str,
+        limit: int = Settings.AUTOCOMPLETE_MAX_SUGGESTIONS
+    ) -> List[str]:
+        """
+        Suggest product names for partially typed text.
+        
+        Products whose name or key ingredients contain a word starting with
+        each typed word are returned, name matches first. If nothing
+        matches, products sharing enough trigrams with the text are returned.
+        
+        Args:
+            text: Text typed so far
+            limit: Maximum number of suggestions
+        
+        Returns:
+            Product names, best first
+        """
+        state = self._state
+        words = split_words(text)
+        
+        if not words:
+            return []
+        
+        name_hits: Optional[Set[int]] = None
+        any_hits: Optional[Set[int]] = None
+        
+        for word in words:
+            in_name = state.name_prefixes.get(word, set())
+            in_any = in_name | state.ingredient_prefixes.get(word, set())
+            name_hits = in_name if name_hits is None else name_hits & in_name
+            any_hits = in_any if any_hits is None else any_hits & in_any
+        
+        if not any_hits:
+            return self._fuzzy_suggest(state, text, limit)
+        
+        typed = text.strip().lower()
+        ranked = sorted(
+            any_hits,
+            key=lambda idx: (
+                not state.names[idx].lower().startswith(typed),
+                idx not in name_hits,
+                state.names[idx]
+            )
+        )
+        
+        return [state.names[idx] for idx in ranked[:limit]]
+    
+    @classmethod
+    def _fuzzy_suggest(cls, state: _IndexState, text: str, limit: int) -> List[str]:
+        """Fallback suggestions ranked by shared trigrams with the text."""
+        grams = cls._trigrams(text.strip())
+        counts: Dict[int, int] = defaultdict(int)
+        
+        for gram in grams:
+            for idx in state.trigrams.get(gram, ()):
+                counts[idx] += 1
+        
+        min_shared = Settings.AUTOCOMPLETE_MIN_TRIGRAM_RATIO * len(grams)
+        ranked = sorted(
+            (idx for idx, count in counts.items() if count >= min_shared),
+            key=lambda idx: (-counts[idx], state.names[idx])
+        )
+        
+        return [state.names[idx] for idx in ranked[:limit]]
+    
+    def get_product(self, name: str) -> Optional[Product]:
+        """
+        Look up a product by its exact name (case-insensitive).
+        
+        Args:
+            name: Product name as returned by suggest()
+        
+        Returns:
+            The matching Product, or None
+        """
+        state = self._state
+        idx = state.by_name.get(name.strip().lower())
+        
+        return state.products[idx] if idx is not None else None
+    
+    def __len__(self) -> int:
+        """Number of indexed products."""
+        return len(self._state.products)
@@ -0,0 +1,155 @@
+"""
+Query routing service.
+Decides whether a query can be answered directly from retrieval results
+or needs LLM reasoning.
+"""
+import re
+import threading
+from typing import Dict, List, Tuple, Optional
+
+from langchain.schema import Document
+
+from config.settings import Settings
+from utils.text import tokenize
+
+
+class QueryRouter:
+    """
+    Routes queries between an LLM-free fast path and the LLM.
+    
+    The fast path is taken for catalog lookups (the query names a retrieved
+    product) and for results dominated by a single high-confidence hit.
+    Ambiguous, symptom-style queries are left for the LLM.
+    
+    Scores are relevance scores as returned by
+    VectorStoreManager.similarity_search: 0-1, higher is more similar.
+    """
+    
+    # Words that ask about a product rather than describe a need
+    LOOKUP_WORDS = {"price", "cost", "link", "buy", "egp", "how", "much", "where"}
+    
+    # Product names often end with indications, e.g. "(Analgesic And Anti
+    # Inflammatory)"; only the part before them identifies the product
+    _QUALIFIER_PATTERN = re.compile(r"[(\[]")
+    
+    def __init__(self):
+        """Initialize routing counters."""
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {"total": 0, "lookup": 0, "dominant": 0}
+    
+    def _match_name(
+        self,
+        query: str,
+        results: List[Tuple[Document, float]]
+    ) -> Optional[Tuple[Document, float]]:
+        """
+        Find the single retrieved product whose name the query refers to.
+        
+        Every content word of the query must appear in the product name, and
+        the query must cover at least FAST_PATH_NAME_COVERAGE of the primary
+        name (the part before any parenthesised indication). A symptom word
+        that happens to appear in a name, such as "pain" in "Pain Relief
+        Gel", therefore does not count as a lookup.
+        
+        Args:
+            query: User query
+            results: Retrieved (Document, score) tuples
+        
+        Returns:
+            The matching result, or None if no unique match exists
+        """
+        query_tokens = tokenize(query) - self.LOOKUP_WORDS
+        if not query_tokens:
+            return None
+        
+        matches = []
+        for result in results:
+            name = result[0].metadata.get("name", "")
+            name_tokens = tokenize(name)
+            primary_tokens = tokenize(self._QUALIFIER_PATTERN.split(name)[0])
+            if not primary_tokens:
+                continue
+            
+            query_ratio = len(query_tokens & name_tokens) / len(query_tokens)
+            name_coverage = len(query_tokens & primary_tokens) / len(primary_tokens)
+            if (
+                query_ratio >= Settings.FAST_PATH_NAME_MATCH_RATIO
+                and name_coverage >= Settings.FAST_PATH_NAME_COVERAGE
+            ):
+                matches.append(result)
+        
+        return matches[0] if len(matches) == 1 else None
+    
+    @staticmethod
+    def _dominant_result(
+        results: List[Tuple[Document, float]]
+    ) -> Optional[Tuple[Document, float]]:
+        """
+        Return the top result if it clearly outscores the others.
+        
+        Args:
+            results: Retrieved (Document, relevance_score) tuples
+        
+        Returns:
+            The dominant result, or None
+        """
+        # Results may be in reranked order, so find the best by relevance
+        ranked = sorted(results, key=lambda result: result[1], reverse=True)
+        top_score = ranked[0][1]
+        if top_score < Settings.FAST_PATH_MIN_SCORE:
+            return None
+        
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+        if top_score - runner_up < Settings.FAST_PATH_SCORE_MARGIN:
+            return None
+        
+        return ranked[0]
+    
+    def route(
+        self,
+        query: str,
+        results: List[Tuple[Document, float]]
+    ) -> Optional[List[Tuple[Document, float]]]:
+        """
+        Decide whether the query can skip the LLM.
+        
+        Args:
+            query: User query
+            results: Retrieved (Document, score) tuples, best first
+        
+        Returns:
+            Results to render directly, or None if the LLM should be used
+        """
+        route, selected = "llm", None
+        
+        if Settings.FAST_PATH_ENABLED and results:
+            selected = self._match_name(query, results)
+            if selected is not None:
+                route = "lookup"
+            else:
+                selected = self._dominant_result(results)
+                if selected is not None:
+                    route = "dominant"
+        
+        with self._lock:
+            self._counts["total"] += 1
+            if route != "llm":
+                self._counts[route] += 1
+        
+        return [selected] if selected is not None else None
+    
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Get routing counters.
+        
+        Returns:
+            Dictionary with total, lookup and dominant counts and the
+            share of queries served without the LLM
+        """
+        with self._lock:
+            stats: Dict[str, float] = dict(self._counts)
+        
+        fast = stats["lookup"] + stats["dominant"]
+        stats["fast_path_share"] = fast / stats["total"] if stats["total"] else 0.0
+        
+        return stats
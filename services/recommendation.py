@@ -2,16 +2,27 @@
 Recommendation service.
 Handles product recommendation logic using LLM and vector search.
 """
-from typing import List, Tuple, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from typing import Dict, List, Tuple, Optional
 
 from langchain.schema import Document
+from langchain_core.language_models import BaseChatModel
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 
 from config.settings import Settings
 from config.prompts import Prompts
+from models.product import Product, ProductDocument
 from services.vector_store import VectorStoreManager
+from services.reranker import Reranker
+from services.query_router import QueryRouter
+from services.autocomplete import ProductAutocomplete
 from utils.formatters import ResultFormatter
+from utils.deadline import Deadline, LatencyTracker, hedged_call, run_with_timeout
+from utils.http_client import create_http_client
+from utils.single_flight import SingleFlight
 
 
 class RecommendationService:
@@ -20,21 +31,61 @@ class RecommendationService:
     Combines vector search with LLM-based reasoning.
     """
     
-    def __init__(self, vector_store: VectorStoreManager):
+    def __init__(
+        self, 
+        vector_store: VectorStoreManager,
+        reranker: Optional[Reranker] = None,
+        autocomplete: Optional[ProductAutocomplete] = None,
+        llm: Optional[BaseChatModel] = None
+    ):
         """
         Initialize the recommendation service.
         
         Args:
             vector_store: Initialized VectorStoreManager instance
+            reranker: Optional second-stage Reranker. If omitted, a default
+                one is created when Settings.RERANK_ENABLED is True.
+            autocomplete: Optional ProductAutocomplete index over the catalog
+            llm: Optional chat model. Defaults to ChatOpenAI configured
+                from Settings.
         """
         self.vector_store = vector_store
-        self.llm = ChatOpenAI(
+        if reranker is None and Settings.RERANK_ENABLED:
+            reranker = Reranker()
+        self.reranker = reranker
+        self.router = QueryRouter()
+        self.autocomplete = autocomplete or ProductAutocomplete()
+        self.llm = llm or ChatOpenAI(
             model=Settings.LLM_MODEL,
-            temperature=Settings.LLM_TEMPERATURE
+            temperature=Settings.LLM_TEMPERATURE,
+            max_retries=Settings.LLM_MAX_RETRIES,
+            request_timeout=Settings.HTTP_TIMEOUT,
+            http_client=create_http_client()
         )
         self.prompt_template = ChatPromptTemplate.from_template(
             Prompts.RECOMMENDATION_PROMPT
         )
+        self._single_flight = SingleFlight()
+        # Separate pools, so calls stuck in one stage cannot starve the other
+        self._retrieval_executor = ThreadPoolExecutor(
+            max_workers=Settings.RETRIEVAL_WORKERS,
+            thread_name_prefix="retrieval"
+        )
+        self._llm_executor = ThreadPoolExecutor(
+            max_workers=Settings.LLM_WORKERS,
+            thread_name_prefix="llm"
+        )
+        self._llm_latency = LatencyTracker(Settings.HEDGE_LATENCY_WINDOW)
+        self._stats_lock = threading.Lock()
+        self._resilience_counts: Dict[str, int] = {
+            "requests": 0,
+            "retrieval_timeouts": 0,
+            "retrieval_errors": 0,
+            "llm_timeouts": 0,
+            "llm_errors": 0,
+            "hedges": 0,
+            "fallbacks": 0
+        }
     
     def get_recommendations(
         self, 
@@ -46,35 +97,252 @@ class RecommendationService:
         
         This method:
         1. Queries the vector database for similar products
-        2. Formats the results
-        3. Uses LLM to generate intelligent recommendations
+        2. Reranks the candidates and keeps the top k
+        3. Answers catalog lookups and dominant hits directly, without the LLM
+        4. Otherwise formats the results and uses the LLM to generate
+           intelligent recommendations
+        
+        Concurrent calls with the same normalized query, k and prompt
+        version are coalesced and executed only once.
+        
+        The request is bounded by Settings.REQUEST_DEADLINE_S. If the LLM
+        cannot answer in time, the retrieved products are listed instead.
         
         Args:
             query: User's query describing their needs/symptoms
-            k: Number of top products to consider
+            k: Number of top products to forward to the LLM
             
         Returns:
             LLM-generated recommendation text, or None if no results found
         """
-        # Step 1: Query vector database
-        search_results = self.vector_store.similarity_search(query, k=k)
+        key = (
+            self._normalize_query(query),
+            k,
+            Prompts.RECOMMENDATION_PROMPT_VERSION
+        )
+        
+        return self._single_flight.do(
+            key, lambda: self._generate_recommendations(query, k)
+        )
+    
+    @staticmethod
+    def _normalize_query(query: str) -> str:
+        """Normalize a query for coalescing (case and whitespace)."""
+        return " ".join(query.lower().split())
+    
+    def _generate_recommendations(self, query: str, k: int) -> Optional[str]:
+        """
+        Run retrieval and LLM generation for a single query within the
+        request deadline.
+        
+        Args:
+            query: User's query describing their needs/symptoms
+            k: Number of top products to forward to the LLM
+            
+        Returns:
+            LLM-generated recommendation text, a product listing if the LLM
+            missed the deadline, an unavailability message if retrieval
+            failed, or None if no results found
+        """
+        deadline = Deadline(Settings.REQUEST_DEADLINE_S)
+        self._count("requests")
+        
+        # Step 1: Query vector database and rerank candidates
+        try:
+            search_results = run_with_timeout(
+                self._retrieval_executor,
+                lambda: self._retrieve(query, k),
+                deadline.budget(Settings.RETRIEVAL_DEADLINE_SHARE)
+            )
+        except TimeoutError:
+            self._count("retrieval_timeouts")
+            return Settings.SERVICE_UNAVAILABLE_MESSAGE
+        except Exception as e:
+            print(f"Retrieval failed: {e}")
+            self._count("retrieval_errors")
+            return Settings.SERVICE_UNAVAILABLE_MESSAGE
         
         if not search_results:
             return None
         
-        # Step 2: Format search results as context
+        # Step 2: Skip the LLM when the answer is unambiguous
+        direct_results = self.router.route(query, search_results)
+        if direct_results is not None:
+            return ResultFormatter.format_for_display(direct_results)
+        
+        # Step 3: Format search results as context
         formatted_context = ResultFormatter.format_search_results(search_results)
         
-        # Step 3: Generate LLM recommendation
+        # Step 4: Generate LLM recommendation
         final_prompt = self.prompt_template.format(
             context=formatted_context,
             input=query
         )
         
-        response = self.llm.invoke(final_prompt)
+        try:
+            return self._invoke_llm(final_prompt, deadline)
+        except TimeoutError:
+            self._count("llm_timeouts")
+        except Exception as e:
+            print(f"LLM call failed: {e}")
+            self._count("llm_errors")
+        
+        # Degrade to the plain product listing
+        self._count("fallbacks")
+        return ResultFormatter.format_for_display(search_results)
+    
+    def _invoke_llm(self, prompt: str, deadline: Deadline) -> str:
+        """
+        Call the LLM, hedging with a backup request if it is slow.
+        
+        The backup is sent after the observed p95 LLM latency, once enough
+        samples exist, or after Settings.HEDGE_DEFAULT_DELAY_S before that.
+        Each call's HTTP timeout is the time left on the deadline, so calls
+        that lose to the backup or miss the deadline do not keep holding a
+        worker thread and a pooled connection.
+        
+        Args:
+            prompt: Fully formatted prompt
+            deadline: Request deadline bounding the call
+            
+        Returns:
+            LLM response text
+            
+        Raises:
+            concurrent.futures.TimeoutError: If no response arrives in time
+            Any exception raised by the LLM client
+        """
+        hedge_delay = None
+        if Settings.HEDGE_ENABLED:
+            hedge_delay = Settings.HEDGE_DEFAULT_DELAY_S
+            if len(self._llm_latency) >= Settings.HEDGE_MIN_SAMPLES:
+                hedge_delay = max(
+                    Settings.HEDGE_MIN_DELAY_S,
+                    self._llm_latency.percentile(Settings.HEDGE_PERCENTILE)
+                )
+        
+        def call():
+            # Record each call's own latency, including hedged-out ones;
+            # a call that times out counts as its whole budget
+            budget = deadline.remaining()
+            start = time.monotonic()
+            try:
+                response = self.llm.invoke(prompt, timeout=budget)
+            except Exception:
+                if time.monotonic() - start >= budget:
+                    self._llm_latency.record(budget)
+                raise
+            self._llm_latency.record(time.monotonic() - start)
+            return response
+        
+        response, _ = hedged_call(
+            self._llm_executor,
+            call,
+            deadline.remaining(),
+            hedge_delay,
+            on_hedge=lambda: self._count("hedges")
+        )
         
         return response.content
     
+    def _count(self, name: str) -> None:
+        """Increment a resilience counter."""
+        with self._stats_lock:
+            self._resilience_counts[name] += 1
+    
+    def _retrieve(self, query: str, k: int) -> List[Tuple[Document, float]]:
+        """
+        Retrieve the top k candidates, over-fetching and reranking if enabled.
+        
+        Args:
+            query: Search query string
+            k: Number of results to keep
+            
+        Returns:
+            List of (Document, score) tuples
+        """
+        if self.reranker is None:
+            return self.vector_store.similarity_search(query, k=k)
+        
+        candidates = self.vector_store.similarity_search(
+            query, k=max(k, Settings.RERANK_CANDIDATES)
+        )
+        
+        return self.reranker.rerank(query, candidates, top_n=k)
+    
+    def suggest_products(self, text: str) -> List[str]:
+        """
+        Suggest product names for partially typed text.
+        
+        Served from the in-memory autocomplete index; no API calls are made.
+        
+        Args:
+            text: Text typed so far
+            
+        Returns:
+            Matching product names, best first
+        """
+        return self.autocomplete.suggest(text)
+    
+    def get_product_result(self, product_name: str) -> Optional[str]:
+        """
+        Render a single product chosen from the autocomplete suggestions.
+        
+        Args:
+            product_name: Exact product name as returned by suggest_products
+            
+        Returns:
+            Formatted product listing, or None if the product is unknown
+        """
+        product = self.autocomplete.get_product(product_name)
+        
+        if product is None:
+            return None
+        
+        return ResultFormatter.format_for_display([(product.to_document(), 1.0)])
+    
+    def sync_catalog(self, products: List[Product]) -> None:
+        """
+        Refresh the service after the product catalog changes.
+        
+        The autocomplete index is swapped immediately; the vector store is
+        rebuilt in the background while the current generation keeps serving.
+        
+        Args:
+            products: Full updated product catalog
+        """
+        self.autocomplete.refresh(products)
+        self.vector_store.rebuild(ProductDocument.from_products(products))
+    
+    def get_routing_stats(self) -> dict:
+        """
+        Get counters for queries served with and without the LLM.
+        
+        Returns:
+            Dictionary of routing counters, see QueryRouter.get_stats
+        """
+        return self.router.get_stats()
+    
+    def get_resilience_stats(self) -> Dict[str, float]:
+        """
+        Get timeout, hedge and fallback counters.
+        
+        Returns:
+            Dictionary of raw counts plus timeout_rate, hedge_rate and
+            fallback_rate as shares of all requests
+        """
+        with self._stats_lock:
+            stats: Dict[str, float] = dict(self._resilience_counts)
+        
+        requests = stats["requests"] or 1
+        stats["timeout_rate"] = (
+            stats["retrieval_timeouts"] + stats["llm_timeouts"]
+        ) / requests
+        stats["hedge_rate"] = stats["hedges"] / requests
+        stats["fallback_rate"] = stats["fallbacks"] / requests
+        
+        return stats
+    
     def get_raw_search_results(
         self, 
         query: str, 
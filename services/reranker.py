@@ -0,0 +1,163 @@
+"""
+Reranking service.
+Rescores over-fetched vector search candidates locally so that only the
+most relevant few are forwarded to the LLM.
+"""
+import time
+from typing import List, Tuple, Optional, Set
+
+from langchain.schema import Document
+
+from config.settings import Settings
+from utils.text import tokenize, extract_sections
+
+
+class Reranker:
+    """
+    Second-stage reranker applied between vector search and the LLM.
+    
+    Candidates are rescored on CPU using lexical overlap with the query,
+    matches against the product name and the "Composition" / "Indication"
+    sections of the description, and optionally a small cross-encoder.
+    Scoring stops once the time budget is spent; candidates that were not
+    rescored keep their original vector order behind the rescored ones.
+    
+    Vector scores are relevance scores as returned by
+    VectorStoreManager.similarity_search: 0-1, higher is more similar.
+    """
+    
+    FIELD_HEADINGS = ("composition", "ingredients?", "indications?")
+    
+    def __init__(
+        self,
+        budget_ms: float = Settings.RERANK_BUDGET_MS,
+        cross_encoder_model: Optional[str] = Settings.RERANK_CROSS_ENCODER_MODEL
+    ):
+        """
+        Initialize the reranker.
+        
+        Args:
+            budget_ms: Maximum time in milliseconds to spend rescoring
+            cross_encoder_model: Optional sentence-transformers cross-encoder
+                name. Ignored if sentence-transformers is not installed.
+        """
+        self.budget_ms = budget_ms
+        self._cross_encoder = self._load_cross_encoder(cross_encoder_model)
+    
+    @staticmethod
+    def _load_cross_encoder(model_name: Optional[str]):
+        """Load the optional cross-encoder, returning None if unavailable."""
+        if not model_name:
+            return None
+        
+        try:
+            from sentence_transformers import CrossEncoder
+        except ImportError:
+            print("sentence-transformers not installed; using lexical reranking.")
+            return None
+        
+        return CrossEncoder(model_name)
+    
+    @staticmethod
+    def _overlap(query_tokens: Set[str], text_tokens: Set[str]) -> float:
+        """Fraction of query tokens present in the text tokens."""
+        if not query_tokens:
+            return 0.0
+        return len(query_tokens & text_tokens) / len(query_tokens)
+    
+    def score(self, query: str, doc: Document, vector_score: float) -> float:
+        """
+        Compute the lexical rerank score for a single candidate.
+        
+        Args:
+            query: User query
+            doc: Candidate document
+            vector_score: Relevance score returned by the vector store
+                (0-1, higher is more similar)
+        
+        Returns:
+            Combined relevance score (higher is better)
+        """
+        query_tokens = tokenize(query)
+        name_tokens = tokenize(doc.metadata.get("name", ""))
+        field_tokens = tokenize(
+            extract_sections(doc.page_content, self.FIELD_HEADINGS)
+        )
+        body_tokens = tokenize(doc.page_content)
+        
+        return (
+            Settings.RERANK_VECTOR_WEIGHT * vector_score
+            + Settings.RERANK_NAME_WEIGHT * self._overlap(query_tokens, name_tokens)
+            + Settings.RERANK_FIELD_WEIGHT * self._overlap(query_tokens, field_tokens)
+            + Settings.RERANK_LEXICAL_WEIGHT * self._overlap(query_tokens, body_tokens)
+        )
+    
+    def _score_batch(
+        self,
+        query: str,
+        batch: List[Tuple[Document, float]]
+    ) -> List[float]:
+        """
+        Score a batch of candidates with the cross-encoder or lexically.
+        
+        Args:
+            query: User query
+            batch: (Document, relevance_score) tuples to score
+        
+        Returns:
+            One score per candidate (higher is better)
+        """
+        if self._cross_encoder is not None:
+            pairs = [(query, doc.page_content) for doc, _ in batch]
+            return [float(score) for score in self._cross_encoder.predict(pairs)]
+        
+        return [self.score(query, doc, vector_score) for doc, vector_score in batch]
+    
+    def rerank(
+        self,
+        query: str,
+        candidates: List[Tuple[Document, float]],
+        top_n: int = Settings.DEFAULT_TOP_K
+    ) -> List[Tuple[Document, float]]:
+        """
+        Rerank candidates and keep the best few.
+        
+        The original relevance score is kept in each returned tuple so that
+        downstream formatting and thresholds are unaffected.
+        
+        Args:
+            query: User query
+            candidates: List of (Document, relevance_score) tuples in
+                vector order
+            top_n: Number of candidates to keep
+        
+        Returns:
+            The top_n (Document, relevance_score) tuples in reranked order
+        """
+        if len(candidates) <= 1:
+            return candidates[:top_n]
+        
+        # The cross-encoder is called in small batches so the budget can be
+        # checked between them; lexical scoring is checked per candidate
+        batch_size = Settings.RERANK_BATCH_SIZE if self._cross_encoder is not None else 1
+        deadline = time.perf_counter() + self.budget_ms / 1000
+        scored = []
+        
+        for start in range(0, len(candidates), batch_size):
+            if time.perf_counter() > deadline:
+                # Budget exhausted: keep the rest in vector order
+                scored.extend(
+                    (float("-inf"), idx, candidate)
+                    for idx, candidate in enumerate(candidates[start:], start)
+                )
+                break
+            batch = candidates[start:start + batch_size]
+            scores = self._score_batch(query, batch)
+            scored.extend(
+                (score, idx, candidate)
+                for idx, (score, candidate) in enumerate(zip(scores, batch), start)
+            )
+        
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        
+        return [candidate for _, _, candidate in scored][:top_n]
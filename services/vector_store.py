@@ -1,79 +1,397 @@
 """
 Vector store service.
 Manages Chroma vector database initialization, persistence, and querying.
+
+The database is stored as versioned generations so it can be rebuilt
+without downtime:
+
+    chroma_db/
+    ├── CURRENT                  # Name of the serving generation
+    └── generations/
+        ├── gen-20240101120000000000-ab12cd/
+        │   ├── manifest.json    # Embedding model and document count
+        │   └── ...              # Chroma files
+        └── gen-20240102120000000000-ef34ab/
+
+A new generation is built in the background, validated, and then swapped in
+by atomically rewriting CURRENT. Older generations are garbage-collected.
 """
+import json
 import os
+import shutil
+import threading
+import uuid
+from datetime import datetime
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 
 from langchain.schema import Document
 from langchain.vectorstores import Chroma
-from langchain.embeddings import OpenAIEmbeddings
+from langchain_openai import OpenAIEmbeddings
 
 from config.settings import Settings
+from utils.http_client import create_http_client
 
 
 class VectorStoreManager:
     """
     Manages the Chroma vector database for product embeddings.
-    Handles creation, persistence, and loading of the vector store.
+    Handles creation, persistence, loading and blue/green rebuilds of the
+    vector store.
     """
     
+    POINTER_FILE = "CURRENT"
+    MANIFEST_FILE = "manifest.json"
+    GENERATIONS_DIR = "generations"
+    
     def __init__(self):
         """Initialize the vector store manager with configuration settings."""
         self.persist_directory = Settings.PERSIST_DIRECTORY
-        self.embedding_model = OpenAIEmbeddings(model=Settings.EMBEDDING_MODEL)
+        self.generations_directory = Path(self.persist_directory) / self.GENERATIONS_DIR
+        self._embeddings: Dict[str, OpenAIEmbeddings] = {}
+        self.embedding_model = self._create_embeddings(
+            Settings.EMBEDDING_MODEL,
+            Settings.INDEX_EMBEDDING_TIMEOUT,
+            Settings.INDEX_EMBEDDING_MAX_RETRIES
+        )
         self._vectordb: Optional[Chroma] = None
+        self._generation: Optional[str] = None
+        self._rebuild_lock = threading.Lock()
+        self._rebuild_running = False
+        self._pending_documents: Optional[List[Document]] = None
+    
+    @staticmethod
+    def _create_embeddings(
+        model: str,
+        timeout: float,
+        max_retries: int
+    ) -> OpenAIEmbeddings:
+        """
+        Create an embeddings client backed by its own connection pool.
+        
+        Args:
+            model: Embedding model name
+            timeout: Request timeout in seconds
+            max_retries: Retries after a failed request
+        
+        Returns:
+            OpenAIEmbeddings instance
+        """
+        # request_timeout must be set explicitly: left as None, it disables
+        # the timeout of the pooled client
+        return OpenAIEmbeddings(
+            model=model,
+            request_timeout=timeout,
+            max_retries=max_retries,
+            http_client=create_http_client(timeout=timeout)
+        )
+    
+    def _get_embeddings(self, model: str) -> OpenAIEmbeddings:
+        """
+        Get the query embeddings client for a model, creating it on first use.
+        
+        Each generation must be queried with the model it was built with.
+        Query clients time out within the retrieval budget and do not retry,
+        unlike embedding_model, which is only used to build generations.
+        
+        Args:
+            model: Embedding model name
+        
+        Returns:
+            OpenAIEmbeddings instance backed by its own connection pool
+        """
+        if model not in self._embeddings:
+            self._embeddings[model] = self._create_embeddings(
+                model,
+                Settings.EMBEDDING_TIMEOUT,
+                Settings.EMBEDDING_MAX_RETRIES
+            )
+        return self._embeddings[model]
     
     def initialize(self, documents: List[Document], force_recreate: bool = False) -> None:
         """
         Initialize or load the vector database.
         
+        If a generation is already serving, it is loaded immediately. A
+        rebuild is started in the background when force_recreate is True or
+        when the serving generation was built with a different embedding
+        model or distance space than configured in Settings.
+        
         Args:
             documents: List of Document objects to embed and store
-            force_recreate: If True, recreate the database even if it exists
+            force_recreate: If True, rebuild the database even if it exists
         """
-        db_exists = os.path.exists(self.persist_directory)
+        generation = self._read_pointer()
         
-        if force_recreate or not db_exists:
+        if generation is None:
             self._create_vector_db(documents)
-        else:
-            self._load_vector_db()
+            return
+        
+        self._load_vector_db(generation)
+        
+        manifest = self._read_manifest(generation)
+        outdated = (
+            manifest.get("embedding_model") != Settings.EMBEDDING_MODEL
+            or manifest.get("distance_space") != Settings.VECTOR_DISTANCE_SPACE
+        )
+        if force_recreate or outdated:
+            self.rebuild(documents)
+    
+    def rebuild(self, documents: List[Document], background: bool = True) -> None:
+        """
+        Build a new generation and swap it in once validated.
+        
+        The current generation keeps serving queries until the swap.
+        Only one rebuild runs at a time. A request made while one is running
+        is queued, replacing any earlier queued request, and is built as
+        soon as the running one finishes; the latest documents always win.
+        
+        Args:
+            documents: List of Document objects to embed and store
+            background: If True, build in a daemon thread and return at once.
+                If False and a rebuild is already running, the documents are
+                queued for it and this call returns without waiting.
+        """
+        with self._rebuild_lock:
+            self._pending_documents = documents
+            if self._rebuild_running:
+                print("Vector database rebuild queued behind the running one.")
+                return
+            self._rebuild_running = True
+        
+        if not background:
+            self._run_rebuilds()
+            return
+        
+        threading.Thread(target=self._run_rebuilds, daemon=True).start()
+    
+    def _run_rebuilds(self) -> None:
+        """Build queued document sets until none are left (blocking)."""
+        while True:
+            with self._rebuild_lock:
+                documents = self._pending_documents
+                self._pending_documents = None
+                if documents is None:
+                    self._rebuild_running = False
+                    return
+            
+            try:
+                self._create_vector_db(documents)
+            except Exception as e:
+                print(f"Vector database rebuild failed: {e}")
     
     def _create_vector_db(self, documents: List[Document]) -> None:
         """
-        Create a new vector database from documents.
+        Create a new generation from documents and make it the serving one.
         
         Args:
             documents: List of Document objects to embed and store
+        
+        The generation directory is removed if any step fails, and the
+        manifest is only written once the generation has passed validation,
+        so a directory without a manifest is always an incomplete build.
+        
+        Raises:
+            RuntimeError: If the new generation fails validation
+            Any exception raised while embedding or persisting
         """
-        print("Creating new vector database...")
+        generation = f"gen-{datetime.now():%Y%m%d%H%M%S%f}-{uuid.uuid4().hex[:6]}"
+        directory = self.generations_directory / generation
         
-        self._vectordb = Chroma.from_documents(
-            documents=documents,
-            embedding=self.embedding_model,
-            persist_directory=self.persist_directory
-        )
+        print(f"Creating new vector database generation {generation}...")
+        
+        try:
+            vectordb = Chroma.from_documents(
+                documents=documents,
+                embedding=self.embedding_model,
+                persist_directory=str(directory),
+                collection_metadata={"hnsw:space": Settings.VECTOR_DISTANCE_SPACE}
+            )
+            
+            # Persist the database to disk
+            vectordb.persist()
+            
+            if not self._validate(vectordb, documents):
+                raise RuntimeError(f"Generation {generation} failed validation")
+            
+            self._write_manifest(generation, len(documents))
+        except BaseException:
+            shutil.rmtree(directory, ignore_errors=True)
+            raise
         
-        # Persist the database to disk
-        self._vectordb.persist()
+        # Serve through the query client rather than the bulk indexing one
+        self._swap(generation, self._open_generation(generation))
+        self._collect_garbage()
         
-        print(f"Vector database created and persisted at {self.persist_directory}")
+        print(f"Vector database created and persisted at {directory}")
     
-    def _load_vector_db(self) -> None:
-        """Load an existing vector database from disk."""
-        print("Loading existing vector database...")
+    def _load_vector_db(self, generation: str) -> None:
+        """
+        Load an existing generation from disk.
         
-        self._vectordb = Chroma(
-            persist_directory=self.persist_directory,
-            embedding_function=self.embedding_model
-        )
+        Args:
+            generation: Name of the generation to load
+        """
+        print(f"Loading vector database generation {generation}...")
+        
+        self._vectordb = self._open_generation(generation)
+        self._generation = generation
         
         print("Vector database loaded successfully.")
     
+    def _open_generation(self, generation: str) -> Chroma:
+        """
+        Open a generation for querying with the model it was built with.
+        
+        Args:
+            generation: Name of the generation to open
+        
+        Returns:
+            Chroma database backed by the query embeddings client
+        """
+        manifest = self._read_manifest(generation)
+        embedding = self._get_embeddings(
+            manifest.get("embedding_model", Settings.EMBEDDING_MODEL)
+        )
+        
+        return Chroma(
+            persist_directory=str(self.generations_directory / generation),
+            embedding_function=embedding
+        )
+    
+    def _validate(self, vectordb: Chroma, documents: List[Document]) -> bool:
+        """
+        Check a freshly built generation before it starts serving.
+        
+        Verifies the document count and that sample products are found
+        when searching with their own description.
+        
+        Args:
+            vectordb: The new Chroma database
+            documents: Documents the database was built from
+        
+        Returns:
+            True if the generation is fit to serve
+        """
+        count = vectordb._collection.count()
+        if count != len(documents):
+            print(f"Validation failed: expected {len(documents)} documents, found {count}")
+            return False
+        
+        samples = [doc for doc in documents if doc.page_content.strip()]
+        samples = samples[:Settings.INDEX_VALIDATION_SAMPLES]
+        if not samples:
+            return True
+        
+        hits = 0
+        for doc in samples:
+            results = vectordb.similarity_search(
+                doc.page_content, k=Settings.INDEX_VALIDATION_K
+            )
+            hits += any(
+                result.metadata.get("name") == doc.metadata.get("name")
+                for result in results
+            )
+        
+        recall = hits / len(samples)
+        if recall < Settings.INDEX_MIN_RECALL:
+            print(f"Validation failed: sample recall {recall:.2f}")
+            return False
+        
+        return True
+    
+    def _swap(self, generation: str, vectordb: Chroma) -> None:
+        """
+        Atomically make a generation the serving one.
+        
+        Args:
+            generation: Name of the new generation
+            vectordb: Loaded Chroma database for that generation
+        """
+        pointer = Path(self.persist_directory) / self.POINTER_FILE
+        tmp_pointer = pointer.with_suffix(".tmp")
+        tmp_pointer.write_text(generation, encoding="utf-8")
+        os.replace(tmp_pointer, pointer)
+        
+        # Single reference assignment: in-flight queries finish on the old db
+        self._vectordb = vectordb
+        self._generation = generation
+    
+    def _collect_garbage(self) -> None:
+        """
+        Delete old and incomplete generations and legacy database files.
+        
+        Keeps the serving generation plus the newest complete ones, up to
+        INDEX_KEEP_GENERATIONS in total. Generations without a manifest are
+        left over from failed or interrupted builds and are always removed.
+        Must only run while no other build is in progress.
+        """
+        root = Path(self.persist_directory)
+        
+        # Chroma files from before versioned generations live in the root
+        for path in root.iterdir():
+            if path.name in (self.POINTER_FILE, self.GENERATIONS_DIR):
+                continue
+            if path.is_dir():
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                path.unlink(missing_ok=True)
+        
+        complete = []
+        for path in self.generations_directory.iterdir():
+            if not path.is_dir() or path.name == self._generation:
+                continue
+            if (path / self.MANIFEST_FILE).exists():
+                complete.append(path)
+            else:
+                shutil.rmtree(path, ignore_errors=True)
+        
+        # The serving generation always counts towards the kept ones
+        complete.sort()
+        keep = max(0, Settings.INDEX_KEEP_GENERATIONS - 1)
+        for path in complete[:max(0, len(complete) - keep)]:
+            shutil.rmtree(path, ignore_errors=True)
+    
+    def _read_pointer(self) -> Optional[str]:
+        """
+        Read the name of the serving generation.
+        
+        Returns:
+            Generation name, or None if no generation has been built
+        """
+        pointer = Path(self.persist_directory) / self.POINTER_FILE
+        if not pointer.exists():
+            return None
+        
+        generation = pointer.read_text(encoding="utf-8").strip()
+        if not (self.generations_directory / generation).exists():
+            return None
+        
+        return generation
+    
+    def _read_manifest(self, generation: str) -> dict:
+        """Read a generation's manifest, or an empty dict if missing."""
+        path = self.generations_directory / generation / self.MANIFEST_FILE
+        if not path.exists():
+            return {}
+        return json.loads(path.read_text(encoding="utf-8"))
+    
+    def _write_manifest(self, generation: str, document_count: int) -> None:
+        """Record how a generation was built."""
+        path = self.generations_directory / generation / self.MANIFEST_FILE
+        path.write_text(
+            json.dumps({
+                "embedding_model": Settings.EMBEDDING_MODEL,
+                "distance_space": Settings.VECTOR_DISTANCE_SPACE,
+                "document_count": document_count,
+                "created_at": datetime.now().isoformat()
+            }, indent=2),
+            encoding="utf-8"
+        )
+    
     def similarity_search(
-        self, 
-        query: str, 
+        self,
+        query: str,
         k: int = Settings.DEFAULT_TOP_K,
         score_threshold: float = Settings.SIMILARITY_THRESHOLD
     ) -> List[Tuple[Document, float]]:
@@ -86,24 +404,31 @@ class VectorStoreManager:
             score_threshold: Minimum similarity score threshold (0-1)
             
         Returns:
-            List of tuples containing (Document, similarity_score)
+            List of tuples containing (Document, similarity_score), where
+            the score is a 0-1 relevance (higher is better)
             Only returns results above the threshold
             
         Raises:
             RuntimeError: If vector database is not initialized
         """
-        if self._vectordb is None:
+        # Take one reference so a concurrent swap cannot affect this query
+        vectordb = self._vectordb
+        
+        if vectordb is None:
             raise RuntimeError(
                 "Vector database not initialized. Call initialize() first."
             )
         
-        # Get results with similarity scores
-        results_with_score = self._vectordb.similarity_search_with_score(query, k=k)
+        # Get results with relevance scores (0-1, higher is more similar);
+        # similarity_search_with_score would return raw distances instead
+        results_with_score = vectordb.similarity_search_with_relevance_scores(
+            query, k=k
+        )
         
         # Filter by threshold
         filtered_results = [
-            (doc, score) 
-            for doc, score in results_with_score 
+            (doc, score)
+            for doc, score in results_with_score
             if score >= score_threshold
         ]
         
@@ -114,6 +439,17 @@ class VectorStoreManager:
         """Check if the vector database is initialized."""
         return self._vectordb is not None
     
+    @property
+    def is_rebuilding(self) -> bool:
+        """Check if a background rebuild is in progress."""
+        with self._rebuild_lock:
+            return self._rebuild_running
+    
+    @property
+    def generation(self) -> Optional[str]:
+        """Name of the generation currently serving queries."""
+        return self._generation
+    
     def get_collection_count(self) -> int:
         """
         Get the number of documents in the vector store.
@@ -121,10 +457,11 @@ class VectorStoreManager:
         Returns:
             Number of documents, or 0 if not initialized
         """
-        if not self.is_initialized:
+        vectordb = self._vectordb
+        if vectordb is None:
             return 0
         
         try:
-            return self._vectordb._collection.count()
+            return vectordb._collection.count()
         except Exception:
             return 0
@@ -0,0 +1,78 @@
+"""Shared pytest configuration and fixtures."""
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from langchain.schema import Document
+
+# Add project root to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def make_doc(name: str, description: str = "") -> Document:
+    """Build a product Document with the metadata the app expects."""
+    return Document(
+        page_content=description,
+        metadata={"name": name, "link": f"https://example.com/{name}", "price": "EGP1"}
+    )
+
+
+@pytest.fixture
+def doc_factory():
+    """Factory for product Documents."""
+    return make_doc
+
+
+class StubVectorStore:
+    """Stand-in vector store returning fixed results and counting calls."""
+    
+    def __init__(self, results, delay: float = 0.0):
+        self.results = results
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+    
+    def similarity_search(self, query, k=2, score_threshold=0.0):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return self.results[:k]
+
+
+class FakeLLM:
+    """
+    Fault-injecting stand-in chat model.
+    
+    behaviour(n) is called with the 0-based call number and returns a delay
+    in seconds, or an exception instance to raise. Per-call timeouts passed
+    by the caller are recorded in timeouts.
+    """
+    
+    def __init__(self, behaviour):
+        self.behaviour = behaviour
+        self.calls = 0
+        self.timeouts = []
+        self._lock = threading.Lock()
+    
+    def invoke(self, prompt, timeout=None):
+        with self._lock:
+            n = self.calls
+            self.calls += 1
+            self.timeouts.append(timeout)
+        outcome = self.behaviour(n)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        time.sleep(outcome)
+        return SimpleNamespace(content=f"answer {n}")
+
+
+@pytest.fixture
+def symptom_results():
+    """Two close results for a symptom query, so the LLM path is used."""
+    return [
+        (make_doc("Deep Massage Spray", "Indication\nmuscle pain"), 0.7),
+        (make_doc("Lady Sept Wash", "Indication\nvaginal infections"), 0.68),
+    ]
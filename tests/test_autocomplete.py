@@ -0,0 +1,84 @@
+"""Tests for the in-memory product autocomplete index."""
+import time
+
+import pytest
+
+from conftest import FakeLLM, StubVectorStore
+from models.product import Product
+from services.autocomplete import ProductAutocomplete
+from services.recommendation import RecommendationService
+
+
+def product(name: str, description: str = "") -> Product:
+    return Product(name, "EGP10", description, f"https://example.com/{name}")
+
+
+CATALOG = [
+    product("Deep Massage Spray (Analgesic And Anti Inflammatory)"),
+    product(
+        "Lady Sept ( Feminine Wash )",
+        "Composition\nSodium lauryl ether sulfate, thymol, menthol\nIndication\nhygiene"
+    ),
+    product("Lady Sept ( Vaginal Tightening)"),
+]
+
+
+@pytest.fixture
+def autocomplete():
+    return ProductAutocomplete(CATALOG)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("dee", ["Deep Massage Spray (Analgesic And Anti Inflammatory)"]),
+    ("deep mas", ["Deep Massage Spray (Analgesic And Anti Inflammatory)"]),
+    ("lady sept fem", ["Lady Sept ( Feminine Wash )"]),
+    ("menth", ["Lady Sept ( Feminine Wash )"]),
+    ("dep masage", ["Deep Massage Spray (Analgesic And Anti Inflammatory)"]),
+    ("xyz", []),
+    ("", []),
+])
+def test_suggest(autocomplete, text, expected):
+    assert autocomplete.suggest(text) == expected
+
+
+def test_name_prefix_matches_rank_first(autocomplete):
+    assert autocomplete.suggest("la") == [
+        "Lady Sept ( Feminine Wash )",
+        "Lady Sept ( Vaginal Tightening)",
+    ]
+
+
+def test_indication_text_is_not_indexed_as_ingredient(autocomplete):
+    assert autocomplete.suggest("hygiene") == []
+
+
+def test_suggest_is_sub_millisecond(autocomplete):
+    start = time.perf_counter()
+    for _ in range(1000):
+        autocomplete.suggest("lady se")
+    assert (time.perf_counter() - start) / 1000 < 0.001
+
+
+def test_refresh_swaps_catalog(autocomplete):
+    autocomplete.refresh([product("Vita Boost")])
+    
+    assert autocomplete.suggest("lady") == []
+    assert autocomplete.suggest("vit") == ["Vita Boost"]
+    assert len(autocomplete) == 1
+
+
+def test_get_product_is_case_insensitive(autocomplete):
+    assert autocomplete.get_product(" lady sept ( feminine wash ) ") is CATALOG[1]
+    assert autocomplete.get_product("unknown") is None
+
+
+def test_selected_product_is_rendered_without_backend_calls(autocomplete):
+    vector_store = StubVectorStore([])
+    llm = FakeLLM(lambda n: 0)
+    service = RecommendationService(vector_store, autocomplete=autocomplete, llm=llm)
+    
+    result = service.get_product_result("Lady Sept ( Feminine Wash )")
+    
+    assert "Lady Sept ( Feminine Wash )" in result
+    assert vector_store.calls == 0
+    assert llm.calls == 0
@@ -0,0 +1,241 @@
+"""Tests for deadlines, hedged LLM calls and graceful degradation."""
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+import pytest
+
+from conftest import FakeLLM, StubVectorStore
+from config.settings import Settings
+from services.recommendation import RecommendationService
+from utils.deadline import Deadline, LatencyTracker, hedged_call
+
+
+@pytest.fixture
+def executor():
+    executor = ThreadPoolExecutor(max_workers=4)
+    yield executor
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+@pytest.fixture
+def fast_deadlines(monkeypatch):
+    """Shrink deadlines and hedge delays so tests run quickly."""
+    monkeypatch.setattr(Settings, "REQUEST_DEADLINE_S", 0.6)
+    monkeypatch.setattr(Settings, "RETRIEVAL_DEADLINE_SHARE", 0.3)
+    monkeypatch.setattr(Settings, "HEDGE_DEFAULT_DELAY_S", 0.1)
+    monkeypatch.setattr(Settings, "HEDGE_MIN_DELAY_S", 0.05)
+    monkeypatch.setattr(Settings, "HEDGE_MIN_SAMPLES", 5)
+
+
+def make_service(symptom_results, llm, delay=0.0):
+    return RecommendationService(StubVectorStore(symptom_results, delay=delay), llm=llm)
+
+
+class Clock:
+    """Record call start times relative to creation."""
+    
+    def __init__(self):
+        self.start = time.monotonic()
+        self.starts = []
+    
+    def wrap(self, behaviour):
+        def fn():
+            self.starts.append(time.monotonic() - self.start)
+            return behaviour(len(self.starts) - 1)
+        return fn
+
+
+def test_backup_is_sent_after_hedge_delay(executor):
+    clock = Clock()
+    fn = clock.wrap(lambda n: time.sleep(1.0 if n == 0 else 0.01) or n)
+    
+    result, hedged = hedged_call(executor, fn, timeout=0.5, hedge_delay=0.1)
+    
+    assert (result, hedged) == (1, True)
+    assert clock.starts[1] == pytest.approx(0.1, abs=0.05)
+
+
+def test_backup_is_sent_immediately_after_failure(executor):
+    clock = Clock()
+    
+    def behaviour(n):
+        if n == 0:
+            raise RuntimeError("provider hiccup")
+        return n
+    
+    result, hedged = hedged_call(executor, clock.wrap(behaviour), timeout=0.5, hedge_delay=0.3)
+    
+    assert (result, hedged) == (1, True)
+    assert clock.starts[1] < 0.05
+
+
+def test_no_backup_when_first_call_is_fast(executor):
+    clock = Clock()
+    
+    result, hedged = hedged_call(executor, clock.wrap(lambda n: n), timeout=0.5, hedge_delay=0.1)
+    
+    assert (result, hedged) == (0, False)
+    assert len(clock.starts) == 1
+
+
+def test_timeout_is_raised_at_deadline(executor):
+    start = time.monotonic()
+    
+    with pytest.raises(TimeoutError):
+        hedged_call(executor, lambda: time.sleep(1.0), timeout=0.2, hedge_delay=0.05)
+    
+    assert time.monotonic() - start == pytest.approx(0.2, abs=0.05)
+
+
+def test_last_error_is_raised_when_every_call_fails(executor):
+    def fail():
+        raise ValueError("down")
+    
+    with pytest.raises(ValueError):
+        hedged_call(executor, fail, timeout=0.5, hedge_delay=0.1)
+
+
+def test_hedging_disabled_sends_one_call(executor):
+    clock = Clock()
+    
+    with pytest.raises(TimeoutError):
+        hedged_call(executor, clock.wrap(lambda n: time.sleep(0.5)), timeout=0.2, hedge_delay=None)
+    
+    assert len(clock.starts) == 1
+
+
+def test_latency_tracker_percentile():
+    tracker = LatencyTracker(window=10)
+    assert tracker.percentile(0.95) is None
+    
+    for seconds in range(1, 21):
+        tracker.record(seconds)
+    
+    assert len(tracker) == 10
+    assert tracker.percentile(0.95) == 20
+    assert tracker.percentile(0.5) == 16
+
+
+def test_deadline_budget_is_capped_by_remaining_time():
+    deadline = Deadline(0.2)
+    time.sleep(0.15)
+    
+    assert deadline.budget(0.5) <= 0.05 + 1e-3
+
+
+def test_service_hedges_slow_llm_call(symptom_results, fast_deadlines):
+    llm = FakeLLM(lambda n: 1.0 if n == 0 else 0.01)
+    service = make_service(symptom_results, llm)
+    
+    start = time.monotonic()
+    result = service.get_recommendations("sore muscles")
+    
+    assert result == "answer 1"
+    assert time.monotonic() - start < 0.4
+    assert service.get_resilience_stats()["hedges"] == 1
+
+
+def test_service_falls_back_to_listing_when_deadline_is_missed(symptom_results, fast_deadlines):
+    llm = FakeLLM(lambda n: 2.0)
+    service = make_service(symptom_results, llm)
+    
+    start = time.monotonic()
+    result = service.get_recommendations("sore muscles")
+    
+    assert time.monotonic() - start == pytest.approx(Settings.REQUEST_DEADLINE_S, abs=0.1)
+    assert result.startswith("### Recommended Products")
+    assert "Deep Massage Spray" in result
+
+
+def test_service_falls_back_when_every_llm_call_fails(symptom_results, fast_deadlines):
+    llm = FakeLLM(lambda n: RuntimeError("provider down"))
+    service = make_service(symptom_results, llm)
+    
+    result = service.get_recommendations("sore muscles")
+    
+    assert result.startswith("### Recommended Products")
+    assert llm.calls == 2
+    assert service.get_resilience_stats()["llm_errors"] == 1
+
+
+def test_service_reports_unavailable_when_retrieval_times_out(symptom_results, fast_deadlines):
+    llm = FakeLLM(lambda n: 0)
+    service = make_service(symptom_results, llm, delay=1.0)
+    
+    result = service.get_recommendations("sore muscles")
+    
+    assert result == Settings.SERVICE_UNAVAILABLE_MESSAGE
+    assert llm.calls == 0
+    assert service.get_resilience_stats()["retrieval_timeouts"] == 1
+
+
+def test_llm_calls_are_bounded_by_remaining_deadline(symptom_results, fast_deadlines):
+    llm = FakeLLM(lambda n: 0.01)
+    service = make_service(symptom_results, llm, delay=0.1)
+    
+    service.get_recommendations("sore muscles")
+    
+    assert 0 < llm.timeouts[0] <= Settings.REQUEST_DEADLINE_S - 0.1
+
+
+def test_timed_out_calls_are_recorded_in_latency_window(
+    symptom_results, fast_deadlines, monkeypatch
+):
+    monkeypatch.setattr(Settings, "HEDGE_ENABLED", False)
+    
+    # Like the HTTP client, give up with an error once the timeout passes
+    def time_out(n):
+        time.sleep(llm.timeouts[n])
+        return TimeoutError("read timeout")
+    
+    llm = FakeLLM(time_out)
+    service = make_service(symptom_results, llm)
+    
+    result = service.get_recommendations("sore muscles")
+    time.sleep(0.05)
+    
+    assert result.startswith("### Recommended Products")
+    assert service._llm_latency.percentile(1.0) == pytest.approx(llm.timeouts[0])
+
+
+def test_resilience_stats_rates(symptom_results, fast_deadlines):
+    # Request 1 is fast, request 2 is rescued by its backup call and
+    # request 3 misses the deadline on both calls
+    delays = [0.01, 2.0, 0.01, 2.0, 2.0]
+    llm = FakeLLM(lambda n: delays[n])
+    service = make_service(symptom_results, llm)
+    
+    for query in ["query one", "query two", "query three"]:
+        service.get_recommendations(query)
+    
+    stats = service.get_resilience_stats()
+    assert stats["requests"] == 3
+    assert stats["hedges"] == 2
+    assert stats["llm_timeouts"] == 1
+    assert stats["fallbacks"] == 1
+    assert stats["hedge_rate"] == pytest.approx(2 / 3)
+    assert stats["timeout_rate"] == pytest.approx(1 / 3)
+    assert stats["fallback_rate"] == pytest.approx(1 / 3)
+
+
+def test_stuck_retrieval_does_not_starve_llm_calls(symptom_results, fast_deadlines, monkeypatch):
+    monkeypatch.setattr(Settings, "RETRIEVAL_WORKERS", 1)
+    service = make_service(symptom_results, FakeLLM(lambda n: 0.01), delay=1.0)
+    
+    assert service.get_recommendations("sore muscles") == Settings.SERVICE_UNAVAILABLE_MESSAGE
+    
+    # The only retrieval worker is still busy with the abandoned search
+    assert service._invoke_llm("prompt", Deadline(0.3)) == "answer 0"
+
+
+def test_stuck_llm_calls_do_not_starve_retrieval(symptom_results, fast_deadlines, monkeypatch):
+    monkeypatch.setattr(Settings, "LLM_WORKERS", 2)
+    llm = FakeLLM(lambda n: 2.0)
+    service = make_service(symptom_results, llm)
+    
+    service.get_recommendations("sore muscles")
+    # Both LLM workers are still busy; retrieval must still run
+    result = service.get_recommendations("aching joints")
+    
+    assert result.startswith("### Recommended Products")
+    assert service.get_resilience_stats()["retrieval_timeouts"] == 0
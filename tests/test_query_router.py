@@ -0,0 +1,66 @@
+"""Tests for LLM-free fast path routing."""
+import pytest
+
+from conftest import make_doc
+from services.query_router import QueryRouter
+
+
+SPRAY = make_doc("Deep Massage Spray (Analgesic And Anti Inflammatory)")
+GEL = make_doc("Pain Relief Gel")
+WASH = make_doc("Lady Sept ( Feminine Wash )")
+TIGHTENING = make_doc("Lady Sept ( Vaginal Tightening)")
+
+
+@pytest.mark.parametrize("query", [
+    "pain",
+    "inflammatory",
+    "I have muscle pain",
+    "anti inflammatory",
+])
+def test_symptom_queries_go_to_llm(query):
+    results = [(SPRAY, 0.5), (GEL, 0.45)]
+    
+    assert QueryRouter().route(query, results) is None
+
+
+@pytest.mark.parametrize("query", [
+    "Deep Massage Spray price",
+    "deep massage spray",
+    "how much is deep massage spray",
+])
+def test_product_name_lookup_skips_llm(query):
+    results = [(GEL, 0.5), (SPRAY, 0.45)]
+    
+    assert QueryRouter().route(query, results) == [(SPRAY, 0.45)]
+
+
+def test_ambiguous_name_goes_to_llm():
+    results = [(WASH, 0.5), (TIGHTENING, 0.48)]
+    
+    assert QueryRouter().route("lady sept price", results) is None
+
+
+def test_dominant_high_relevance_hit_skips_llm():
+    results = [(GEL, 0.5), (SPRAY, 0.82)]
+    
+    assert QueryRouter().route("sore back after gym", results) == [(SPRAY, 0.82)]
+
+
+@pytest.mark.parametrize("results", [
+    [(SPRAY, 0.5), (GEL, 0.1)],
+    [(SPRAY, 0.82), (GEL, 0.75)],
+])
+def test_low_or_close_relevance_goes_to_llm(results):
+    assert QueryRouter().route("sore back after gym", results) is None
+
+
+def test_stats_report_fast_path_share():
+    router = QueryRouter()
+    router.route("deep massage spray price", [(SPRAY, 0.5)])
+    router.route("pain", [(SPRAY, 0.5), (GEL, 0.45)])
+    
+    stats = router.get_stats()
+    
+    assert stats["total"] == 2
+    assert stats["lookup"] == 1
+    assert stats["fast_path_share"] == 0.5
@@ -0,0 +1,61 @@
+"""Tests for the second-stage reranker."""
+import time
+
+from config.settings import Settings
+from services.reranker import Reranker
+
+
+class SlowCrossEncoder:
+    """Stand-in cross-encoder that sleeps per batch and records calls."""
+    
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.batches = []
+    
+    def predict(self, pairs):
+        self.batches.append(len(pairs))
+        time.sleep(self.delay)
+        # Prefer longer descriptions so reranking is visible
+        return [len(text) for _, text in pairs]
+
+
+def test_higher_relevance_wins_without_lexical_overlap(doc_factory):
+    near = (doc_factory("Alpha", "unrelated words"), 0.8)
+    far = (doc_factory("Beta", "other words"), 0.2)
+    
+    assert Reranker(cross_encoder_model=None).rerank("xyz", [far, near], top_n=1) == [near]
+
+
+def test_name_match_outranks_slightly_closer_vector_hit(doc_factory):
+    other = (doc_factory("Lady Sept Wash", "cleanser"), 0.75)
+    named = (doc_factory("Deep Massage Spray", "spray"), 0.7)
+    
+    result = Reranker(cross_encoder_model=None).rerank(
+        "deep massage spray", [other, named], top_n=1
+    )
+    
+    assert result == [named]
+
+
+def test_original_scores_are_preserved(doc_factory):
+    candidates = [(doc_factory("A"), 0.9), (doc_factory("B"), 0.7)]
+    
+    result = Reranker(cross_encoder_model=None).rerank("a", candidates, top_n=2)
+    
+    assert sorted(score for _, score in result) == [0.7, 0.9]
+
+
+def test_cross_encoder_respects_budget(doc_factory, monkeypatch):
+    monkeypatch.setattr(Settings, "RERANK_BATCH_SIZE", 2)
+    reranker = Reranker(budget_ms=10, cross_encoder_model=None)
+    reranker._cross_encoder = SlowCrossEncoder(delay=0.05)
+    candidates = [(doc_factory(f"P{i}", "x" * i), 1 - i / 10) for i in range(6)]
+    
+    start = time.perf_counter()
+    result = reranker.rerank("query", candidates, top_n=3)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    
+    # Only the first batch is scored; the rest keep vector order behind it
+    assert reranker._cross_encoder.batches == [2]
+    assert elapsed_ms < 100
+    assert [doc.metadata["name"] for doc, _ in result] == ["P1", "P0", "P2"]
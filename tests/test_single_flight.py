@@ -0,0 +1,115 @@
+"""Tests for request coalescing."""
+import threading
+import time
+
+import pytest
+
+from conftest import FakeLLM, StubVectorStore
+from services.recommendation import RecommendationService
+from utils.single_flight import SingleFlight
+
+
+N_CALLERS = 10
+
+
+def run_concurrently(fn, n=N_CALLERS):
+    """Start n threads at the same moment and collect their results."""
+    barrier = threading.Barrier(n)
+    results = []
+    lock = threading.Lock()
+    
+    def worker():
+        barrier.wait()
+        value = fn()
+        with lock:
+            results.append(value)
+    
+    threads = [threading.Thread(target=worker) for _ in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    return results
+
+
+def test_single_flight_executes_once_for_concurrent_callers():
+    flight = SingleFlight()
+    calls = []
+    
+    def work():
+        calls.append(1)
+        time.sleep(0.1)
+        return "result"
+    
+    results = run_concurrently(lambda: flight.do("key", work))
+    
+    assert len(calls) == 1
+    assert results == ["result"] * N_CALLERS
+    assert flight.in_flight == 0
+
+
+def test_single_flight_shares_exceptions():
+    flight = SingleFlight()
+    calls = []
+    
+    def work():
+        calls.append(1)
+        time.sleep(0.1)
+        raise ValueError("backend down")
+    
+    def call():
+        try:
+            flight.do("key", work)
+        except ValueError as e:
+            return str(e)
+    
+    assert run_concurrently(call) == ["backend down"] * N_CALLERS
+    assert len(calls) == 1
+
+
+def test_single_flight_does_not_cache_completed_calls():
+    flight = SingleFlight()
+    calls = []
+    
+    flight.do("key", lambda: calls.append(1))
+    flight.do("key", lambda: calls.append(1))
+    
+    assert len(calls) == 2
+
+
+def test_identical_queries_hit_backends_once(symptom_results):
+    vector_store = StubVectorStore(symptom_results, delay=0.05)
+    llm = FakeLLM(lambda n: 0.1)
+    service = RecommendationService(vector_store, llm=llm)
+    
+    queries = iter(["Muscle pain relief"] + ["  muscle   PAIN relief "] * (N_CALLERS - 1))
+    lock = threading.Lock()
+    
+    def call():
+        with lock:
+            query = next(queries)
+        return service.get_recommendations(query)
+    
+    results = run_concurrently(call)
+    
+    assert vector_store.calls == 1
+    assert llm.calls == 1
+    assert results == ["answer 0"] * N_CALLERS
+
+
+@pytest.mark.parametrize("other_k", [1, 3])
+def test_different_k_is_not_coalesced(symptom_results, other_k):
+    vector_store = StubVectorStore(symptom_results, delay=0.1)
+    service = RecommendationService(vector_store, llm=FakeLLM(lambda n: 0.1))
+    ks = iter([2, other_k])
+    lock = threading.Lock()
+    
+    def call():
+        with lock:
+            k = next(ks)
+        return service.get_recommendations("muscle pain relief", k=k)
+    
+    run_concurrently(call, n=2)
+    
+    assert vector_store.calls == 2
@@ -0,0 +1,113 @@
+"""Tests for versioned vector store generations."""
+import threading
+import time
+
+import pytest
+from langchain_community.embeddings import DeterministicFakeEmbedding
+
+from conftest import make_doc
+from config.settings import Settings
+from services.vector_store import VectorStoreManager
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    """VectorStoreManager on a temporary directory with fake embeddings."""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(Settings, "PERSIST_DIRECTORY", str(tmp_path / "chroma_db"))
+    manager = VectorStoreManager()
+    fake = DeterministicFakeEmbedding(size=32)
+    manager._embeddings[Settings.EMBEDDING_MODEL] = fake
+    manager.embedding_model = fake
+    return manager
+
+
+def catalog(version: int):
+    """A small catalog whose descriptions change with the version."""
+    return [make_doc(f"Product {i}", f"description {i} v{version}") for i in range(5)]
+
+
+def generation_dirs(manager):
+    return sorted(path.name for path in manager.generations_directory.iterdir())
+
+
+def test_initialize_builds_and_serves_a_generation(manager):
+    manager.initialize(catalog(1))
+    
+    assert generation_dirs(manager) == [manager.generation]
+    assert manager.get_collection_count() == 5
+    results = manager.similarity_search("description 3 v1", k=1, score_threshold=0.0)
+    assert results[0][0].metadata["name"] == "Product 3"
+    assert results[0][1] == pytest.approx(1.0)
+
+
+def test_rebuild_requested_while_running_is_not_dropped(manager):
+    built = []
+    release = threading.Event()
+    
+    def slow_create(documents):
+        built.append(documents[0].page_content)
+        release.wait(timeout=5)
+    
+    manager._create_vector_db = slow_create
+    manager.rebuild(catalog(1))
+    manager.rebuild(catalog(2))
+    manager.rebuild(catalog(3))
+    release.set()
+    
+    deadline = time.monotonic() + 5
+    while manager.is_rebuilding and time.monotonic() < deadline:
+        time.sleep(0.01)
+    
+    # The running build finishes, then only the latest queued one runs
+    assert built == ["description 0 v1", "description 0 v3"]
+    assert not manager.is_rebuilding
+
+
+def test_failed_build_is_removed_and_old_generation_keeps_serving(manager):
+    manager.initialize(catalog(1))
+    serving = manager.generation
+    
+    class BrokenEmbedding(DeterministicFakeEmbedding):
+        def embed_documents(self, texts):
+            raise RuntimeError("embedding API down")
+    
+    manager.embedding_model = BrokenEmbedding(size=32)
+    manager.rebuild(catalog(2), background=False)
+    
+    assert manager.generation == serving
+    assert generation_dirs(manager) == [serving]
+
+
+def test_garbage_collection_keeps_last_good_generations(manager, monkeypatch):
+    monkeypatch.setattr(Settings, "INDEX_KEEP_GENERATIONS", 2)
+    root = manager.generations_directory.parent
+    root.mkdir(parents=True)
+    (root / "chroma.sqlite3").write_text("legacy")
+    
+    manager.initialize(catalog(1))
+    first = manager.generation
+    manager.rebuild(catalog(2), background=False)
+    second = manager.generation
+    
+    # A newer, interrupted build without a manifest must not count
+    (manager.generations_directory / "gen-99999999999999999999-crash0").mkdir()
+    manager.rebuild(catalog(3), background=False)
+    
+    assert first not in generation_dirs(manager)
+    assert generation_dirs(manager) == sorted([second, manager.generation])
+    assert sorted(path.name for path in root.iterdir()) == ["CURRENT", "generations"]
+
+
+def test_query_embeddings_fit_the_retrieval_budget(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(Settings, "PERSIST_DIRECTORY", str(tmp_path / "chroma_db"))
+    manager = VectorStoreManager()
+    
+    query_client = manager._get_embeddings(Settings.EMBEDDING_MODEL).client._client
+    index_client = manager.embedding_model.client._client
+    
+    assert query_client.timeout == Settings.EMBEDDING_TIMEOUT
+    assert query_client.timeout <= Settings.REQUEST_DEADLINE_S * Settings.RETRIEVAL_DEADLINE_SHARE
+    assert query_client.max_retries == 0
+    assert index_client.timeout == Settings.INDEX_EMBEDDING_TIMEOUT
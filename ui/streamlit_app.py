@@ -2,7 +2,10 @@
 Streamlit UI application.
 Handles all user interface logic and presentation.
 """
+from typing import Optional
+
 import streamlit as st
+from streamlit_searchbox import st_searchbox
 
 from config.settings import Settings
 from services.recommendation import RecommendationService
@@ -30,18 +33,111 @@ def render_sidebar():
         st.write(f"**Email:** {Settings.COMPANY_INFO['email']}")
 
 
+# Session state keys
+SELECTED_PRODUCT_KEY = "selected_product"
+ACTIVE_INPUT_KEY = "active_input"
+LAST_ANSWER_KEY = "last_answer"
+
+
+def _set_active_input(source: str) -> None:
+    """Remember which input the user changed most recently."""
+    st.session_state[ACTIVE_INPUT_KEY] = source
+
+
+def _on_product_selected(product_name: str) -> None:
+    """Show the chosen product in place of any query answer."""
+    st.session_state[SELECTED_PRODUCT_KEY] = product_name
+    _set_active_input("lookup")
+    # The lookup fragment reruns on its own; rerun the app to update results
+    st.rerun()
+
+
+def _on_lookup_cleared() -> None:
+    """Hand the results area back to the text query."""
+    st.session_state[SELECTED_PRODUCT_KEY] = None
+    _set_active_input("query")
+    st.rerun()
+
+
+@st.fragment
+def render_product_lookup(recommendation_service: RecommendationService):
+    """
+    Render the product name typeahead.
+    
+    Suggestions are fetched on every keystroke from the in-memory
+    autocomplete index; no API calls are made. Keystrokes only rerun this
+    fragment. Choosing or clearing a product reruns the app.
+    
+    Args:
+        recommendation_service: Initialized RecommendationService instance
+    """
+    st_searchbox(
+        recommendation_service.suggest_products,
+        placeholder="Look up a product by name or ingredient...",
+        key="product_lookup",
+        rerun_scope="fragment",
+        submit_function=_on_product_selected,
+        reset_function=_on_lookup_cleared
+    )
+
+
+def get_recommendation(
+    recommendation_service: RecommendationService,
+    query: str
+) -> Optional[str]:
+    """
+    Get the answer for a query, reusing the last answer on reruns.
+    
+    Streamlit reruns the script on every interaction, so only a newly
+    submitted query triggers the embedding and LLM calls.
+    
+    Args:
+        recommendation_service: Initialized RecommendationService instance
+        query: Submitted search query
+        
+    Returns:
+        Recommendation text, or None if no products matched
+    """
+    last_answer = st.session_state.get(LAST_ANSWER_KEY)
+    if last_answer is not None and last_answer[0] == query:
+        return last_answer[1]
+    
+    with st.spinner("Searching for products..."):
+        recommendation = recommendation_service.get_recommendations(query)
+    
+    st.session_state[LAST_ANSWER_KEY] = (query, recommendation)
+    return recommendation
+
+
 def render_search_interface(recommendation_service: RecommendationService):
     """
     Render the main search interface.
     
+    The product lookup and the text query share one results area; whichever
+    was changed most recently is shown.
+    
     Args:
         recommendation_service: Initialized RecommendationService instance
     """
-    query = st.text_input("Enter your search query:")
+    render_product_lookup(recommendation_service)
+    query = st.text_input(
+        "Enter your search query:",
+        key="search_query",
+        on_change=_set_active_input,
+        args=("query",)
+    )
+    
+    selected_product = st.session_state.get(SELECTED_PRODUCT_KEY)
+    if selected_product and st.session_state.get(ACTIVE_INPUT_KEY) == "lookup":
+        # Chosen from autocomplete: show the product directly and skip the
+        # embedding + LLM search
+        product_result = recommendation_service.get_product_result(selected_product)
+        if product_result:
+            st.markdown(product_result)
+            return
     
     if query:
-        with st.spinner("Searching for products..."):
-            recommendation = recommendation_service.get_recommendations(query)
+        recommendation = get_recommendation(recommendation_service, query)
         
         if recommendation:
             st.write(recommendation)
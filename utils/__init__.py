@@ -1,4 +1,19 @@
 """Utilities package for helper functions."""
 from .formatters import ResultFormatter
+from .single_flight import SingleFlight
+from .http_client import create_http_client
+from .text import split_words, tokenize, extract_sections
+from .deadline import Deadline, LatencyTracker, hedged_call, run_with_timeout
 
-__all__ = ["ResultFormatter"]
+__all__ = [
+    "ResultFormatter",
+    "SingleFlight",
+    "create_http_client",
+    "split_words",
+    "tokenize",
+    "extract_sections",
+    "Deadline",
+    "LatencyTracker",
+    "hedged_call",
+    "run_with_timeout",
+]
@@ -0,0 +1,174 @@
+"""
+Deadline utilities.
+Per-request time budgets, latency tracking and hedged calls for slow
+upstream APIs.
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import (
+    Executor, Future, FIRST_COMPLETED, TimeoutError, wait
+)
+from typing import Any, Callable, Deque, List, Optional, Tuple
+
+
+class Deadline:
+    """A fixed point in time by which a request must complete."""
+    
+    def __init__(self, seconds: float):
+        """
+        Start a deadline.
+        
+        Args:
+            seconds: Total time budget from now
+        """
+        self.total = seconds
+        self.expires_at = time.monotonic() + seconds
+    
+    def remaining(self) -> float:
+        """Seconds left before the deadline, never negative."""
+        return max(0.0, self.expires_at - time.monotonic())
+    
+    def budget(self, share: float) -> float:
+        """
+        Time allotted to a stage as a share of the total budget.
+        
+        Args:
+            share: Fraction of the total deadline (0-1)
+        
+        Returns:
+            Seconds for the stage, capped by the remaining time
+        """
+        return min(self.total * share, self.remaining())
+    
+    @property
+    def expired(self) -> bool:
+        """Check if the deadline has passed."""
+        return self.remaining() <= 0
+
+
+class LatencyTracker:
+    """Rolling window of call latencies used to derive hedge delays."""
+    
+    def __init__(self, window: int):
+        """
+        Initialize the tracker.
+        
+        Args:
+            window: Number of most recent samples to keep
+        """
+        self._lock = threading.Lock()
+        self._samples: Deque[float] = deque(maxlen=window)
+    
+    def record(self, seconds: float) -> None:
+        """Record one call latency in seconds."""
+        with self._lock:
+            self._samples.append(seconds)
+    
+    def percentile(self, fraction: float) -> Optional[float]:
+        """
+        Get a latency percentile over the window.
+        
+        Args:
+            fraction: Percentile as a fraction, e.g. 0.95
+        
+        Returns:
+            Latency in seconds, or None if there are no samples
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        
+        if not samples:
+            return None
+        
+        return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+    
+    def __len__(self) -> int:
+        """Number of samples in the window."""
+        with self._lock:
+            return len(self._samples)
+
+
+def run_with_timeout(executor: Executor, fn: Callable[[], Any], timeout: float) -> Any:
+    """
+    Run fn on the executor and wait at most timeout seconds.
+    
+    The call is not cancelled on timeout (threads cannot be interrupted);
+    it finishes in the background and its result is discarded.
+    
+    Args:
+        executor: Executor to run the call on
+        fn: Zero-argument callable
+        timeout: Seconds to wait
+    
+    Returns:
+        The result of fn
+    
+    Raises:
+        concurrent.futures.TimeoutError: If fn does not finish in time
+        Any exception raised by fn
+    """
+    return executor.submit(fn).result(timeout=timeout)
+
+
+def hedged_call(
+    executor: Executor,
+    fn: Callable[[], Any],
+    timeout: float,
+    hedge_delay: Optional[float],
+    on_hedge: Optional[Callable[[], None]] = None
+) -> Tuple[Any, bool]:
+    """
+    Run fn, sending a backup call if the first is slow, and take the first
+    successful result.
+    
+    A backup is also sent straight away if the first call fails before the
+    hedge delay, so a single provider error does not fail the request.
+    
+    Args:
+        executor: Executor to run the calls on
+        fn: Zero-argument callable; must be safe to run twice
+        timeout: Total seconds to wait for a result
+        hedge_delay: Seconds before sending the backup, or None to disable
+        on_hedge: Optional callback invoked when the backup is sent
+    
+    Returns:
+        Tuple of (result, whether a backup call was sent)
+    
+    Raises:
+        concurrent.futures.TimeoutError: If no call succeeds in time
+        The last exception raised by fn if every call failed
+    """
+    deadline = Deadline(timeout)
+    pending: List[Future] = [executor.submit(fn)]
+    hedged = hedge_delay is None
+    sent_backup = False
+    last_error: Optional[BaseException] = None
+    
+    while pending:
+        wait_for = deadline.remaining()
+        if not hedged:
+            wait_for = min(wait_for, max(0.0, hedge_delay - (deadline.total - wait_for)))
+        
+        done, not_done = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+        pending = list(not_done)
+        
+        for future in done:
+            if future.exception() is None:
+                return future.result(), sent_backup
+            last_error = future.exception()
+        
+        if deadline.expired:
+            break
+        
+        # Hedge when the delay has elapsed or the first call already failed
+        if not hedged and (not done or not pending):
+            pending.append(executor.submit(fn))
+            hedged = sent_backup = True
+            if on_hedge is not None:
+                on_hedge()
+    
+    if pending or last_error is None:
+        raise TimeoutError(f"No result within {timeout:.2f}s")
+    
+    raise last_error
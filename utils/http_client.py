@@ -0,0 +1,36 @@
+"""
+HTTP client utilities.
+Builds explicitly configured keep-alive connection pools for API clients.
+"""
+from typing import Optional
+
+import httpx
+
+from config.settings import Settings
+
+
+def create_http_client(timeout: Optional[float] = None) -> httpx.Client:
+    """
+    Create a pooled keep-alive HTTP client using the limits in Settings.
+    
+    Each OpenAI-backed client (chat and embeddings) should own one of these
+    so connections are reused across requests instead of re-established.
+    
+    Args:
+        timeout: Read/write timeout in seconds. Defaults to
+            Settings.HTTP_TIMEOUT.
+    
+    Returns:
+        Configured httpx.Client instance
+    """
+    limits = httpx.Limits(
+        max_connections=Settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=Settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=Settings.HTTP_KEEPALIVE_EXPIRY
+    )
+    timeout = httpx.Timeout(
+        Settings.HTTP_TIMEOUT if timeout is None else timeout,
+        connect=Settings.HTTP_CONNECT_TIMEOUT
+    )
+    
+    return httpx.Client(limits=limits, timeout=timeout)
@@ -0,0 +1,75 @@
+"""
+Request coalescing utilities.
+Ensures identical in-flight work is executed once and shared by all callers.
+"""
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class _Call:
+    """A single in-flight call and its eventual outcome."""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share the same key.
+    
+    The first caller for a key executes the function; callers arriving while
+    it is still running wait and receive the same result (or exception).
+    Nothing is cached once the call completes.
+    """
+    
+    def __init__(self):
+        """Initialize an empty registry of in-flight calls."""
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+    
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Execute fn once for all concurrent callers using the same key.
+        
+        Args:
+            key: Hashable identity of the work
+            fn: Zero-argument callable performing the work
+        
+        Returns:
+            The result of fn, shared by all waiters
+        
+        Raises:
+            Any exception raised by fn, re-raised in every waiter
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _Call()
+                self._calls[key] = call
+        
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        
+        return call.result
+    
+    @property
+    def in_flight(self) -> int:
+        """Number of keys currently being executed."""
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,91 @@
+"""
+Text processing utilities.
+Shared tokenization and description parsing used by reranking, query
+routing and autocomplete.
+"""
+import re
+from functools import lru_cache
+from typing import Iterable, List, Set
+
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = {
+    "a", "an", "and", "the", "of", "for", "to", "in", "on", "with", "is",
+    "i", "my", "me", "have", "has", "it", "or", "what", "which", "need",
+    "something", "product", "products", "any", "do", "you"
+}
+
+# Heading lines used in scraped product descriptions
+SECTION_HEADINGS = (
+    "composition", "ingredients?", "indications?", "properties",
+    "how to use", "dosage", "directions?", "precautions?", "package", "storage"
+)
+
+
+def split_words(text: str) -> List[str]:
+    """
+    Lowercase and split text into words, keeping stopwords and short words.
+    
+    Args:
+        text: Input text
+    
+    Returns:
+        Words in order of appearance
+    """
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def tokenize(text: str) -> Set[str]:
+    """
+    Lowercase and split text into a set of content tokens.
+    
+    Args:
+        text: Input text
+    
+    Returns:
+        Set of tokens with stopwords and single characters removed
+    """
+    return {
+        token
+        for token in split_words(text)
+        if token not in STOPWORDS and len(token) > 1
+    }
+
+
+@lru_cache(maxsize=None)
+def _section_pattern(headings: tuple) -> "re.Pattern":
+    """Compile a pattern matching any of the given section heading lines."""
+    return re.compile(
+        r"^\s*(" + "|".join(headings) + r")\s*:?\s*$",
+        re.IGNORECASE | re.MULTILINE
+    )
+
+
+def extract_sections(description: str, headings: Iterable[str]) -> str:
+    """
+    Extract the text under the given headings of a product description.
+    
+    Scraped descriptions use heading lines such as "Composition" and
+    "Indication"; a section runs until the next recognised heading.
+    
+    Args:
+        description: Raw product description
+        headings: Regex alternatives for the heading lines to extract,
+            e.g. ("composition", "indications?")
+    
+    Returns:
+        Concatenated text of the matched sections, or an empty string
+    """
+    all_headings = _section_pattern(tuple(SECTION_HEADINGS))
+    wanted = _section_pattern(tuple(headings))
+    matches = list(all_headings.finditer(description))
+    sections = []
+    
+    for idx, match in enumerate(matches):
+        if not wanted.match(match.group(0)):
+            continue
+        end = matches[idx + 1].start() if idx + 1 < len(matches) else len(description)
+        sections.append(description[match.end():end])
+    
+    return " ".join(sections)